@@ -0,0 +1,36 @@
+"""Load test a confirm dialog: a slash command sends a row of buttons and waits for a click
+on the message it sent, clicks are generated on the buttons of recently sent messages.
+
+Usage: python benchmarks/loadtest_confirm.py [rate] [duration]
+"""
+import asyncio
+import sys
+from discord_styled.buttons import wait_button
+from discord_styled.loadtest import Harness
+from discord_styled.slash import option
+from discord_styled.utils.buttons import Buttons
+
+confirm = Buttons().add("success", "Yes").add("danger", "No")
+
+async def main(rate:float, duration:float) -> int:
+    harness = Harness(seed=1)
+
+    @option("item", "Item to delete")
+    async def delete(ctx, item):
+        row = confirm.render(f"yes:{ctx.interaction_id}", f"no:{ctx.interaction_id}")
+        message = await ctx.send(f"Delete {item}?", components=[row])
+        try:
+            button_ctx = await wait_button(harness.client, row, message, timeout=2)
+        except asyncio.TimeoutError:
+            return
+        await button_ctx.edit_origin(content="Done", components=[])
+
+    harness.add_command(delete)
+    report = await harness.run(rate, duration, weights={"slash": 1, "component": 2}, trace_memory=True)
+    print(report)
+    return 1 if report.errors else 0
+
+if __name__ == "__main__":
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 200
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 3
+    sys.exit(asyncio.get_event_loop().run_until_complete(main(rate, duration)))
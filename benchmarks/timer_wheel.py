@@ -0,0 +1,61 @@
+"""Compare the shared TimerWheel against one asyncio timer per waiter.
+
+Usage: python benchmarks/timer_wheel.py [waiters]
+"""
+import asyncio
+import sys
+import time
+from discord_styled.timers import TimerWheel
+
+def _noop():
+    pass
+
+async def per_waiter(count:int, delay:float, cancel:bool) -> float:
+    loop = asyncio.get_event_loop()
+    start = time.perf_counter()
+    handles = [loop.call_later(delay, _noop) for _ in range(count)]
+    if cancel:
+        for handle in handles:
+            handle.cancel()
+    else:
+        await asyncio.sleep(delay + 0.1)
+    return time.perf_counter() - start
+
+async def wheel(count:int, delay:float, cancel:bool) -> float:
+    timers = TimerWheel(0.05)
+    start = time.perf_counter()
+    handles = [timers.schedule(delay, _noop) for _ in range(count)]
+    if cancel:
+        for handle in handles:
+            handle.cancel()
+    else:
+        await asyncio.sleep(delay + 0.1)
+    return time.perf_counter() - start
+
+async def waiters(count:int, delay:float, use_wheel:bool) -> float:
+    """Futures with a timeout where half of them get a result in time, like confirm dialogs"""
+    loop = asyncio.get_event_loop()
+    timers = TimerWheel(0.05)
+    start = time.perf_counter()
+    futures = [loop.create_future() for _ in range(count)]
+    if use_wheel:
+        handles = [timers.schedule(delay, future.cancel) for future in futures]
+    else:
+        handles = [loop.call_later(delay, future.cancel) for future in futures]
+    for future, handle in zip(futures[::2], handles[::2]):
+        future.set_result(None)
+        handle.cancel()
+    await asyncio.gather(*futures, return_exceptions=True)
+    return time.perf_counter() - start
+
+async def main(count:int) -> None:
+    print(f"{count} timers")
+    for cancel in (True, False):
+        name = "schedule + cancel" if cancel else "schedule + expire"
+        # Subtract the sleep so only the scheduling and expiring cost is compared
+        sleep = 0 if cancel else 0.6
+        print(f"  {name:<24} per waiter {await per_waiter(count, 0.5, cancel) - sleep:.3f}s  wheel {await wheel(count, 0.5, cancel) - sleep:.3f}s")
+    print(f"  {'futures, half answered':<24} per waiter {await waiters(count, 0.5, False) - 0.5:.3f}s  wheel {await waiters(count, 0.5, True) - 0.5:.3f}s")
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000))
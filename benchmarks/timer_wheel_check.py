@@ -0,0 +1,78 @@
+"""Randomized check of TimerWheel on a simulated clock: every timer must fire between `delay`
+and `delay + resolution` seconds after being scheduled, cancelled timers must never fire.
+
+Usage: python benchmarks/timer_wheel_check.py [timers] [seed]
+"""
+import random
+import sys
+from discord_styled.timers import TimerWheel
+
+# (resolution, slots, levels), including delays far beyond what the top level holds
+SETTINGS = [(1, 2, 1), (1, 3, 1), (1, 2, 2), (0.5, 4, 3), (0.25, 8, 2), (1, 64, 4)]
+
+class SimulatedLoop:
+    """Just enough of an event loop for TimerWheel, time only moves when `advance` is called"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.handle = None
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when:float, callback) -> tuple:
+        self.handle = (when, callback)
+        return self.handle
+
+    def call_exception_handler(self, context:dict) -> None:
+        raise context["exception"]
+
+    def advance(self, until:float) -> None:
+        while self.handle is not None and self.handle[0] <= until:
+            when, callback = self.handle
+            self.handle = None
+            self.now = max(self.now, when)
+            callback()
+        self.now = max(self.now, until)
+
+def check(resolution:float, slots:int, levels:int, count:int, rng:random.Random) -> int:
+    loop = SimulatedLoop()
+    wheel = TimerWheel(resolution, slots, levels, loop=loop)
+    # Past the top level when the wheel is small, capped so the simulation doesn't run for millions of ticks
+    max_delay = resolution * min(slots ** levels * 3, 20000)
+    errors = 0
+    pending = {}
+    cancelled = set()
+
+    def fired(index:int, scheduled:float, delay:float) -> None:
+        nonlocal errors
+        late = loop.now - scheduled - delay
+        if index in cancelled or not -1e-9 <= late <= resolution + 1e-9:
+            errors += 1
+        pending.pop(index, None)
+
+    for index in range(count):
+        loop.advance(loop.now + rng.uniform(0, resolution * 1.5))
+        delay = rng.uniform(0, max_delay)
+        pending[index] = wheel.schedule(delay, fired, index, loop.now, delay)
+        victim = rng.randrange(index + 1)
+        if victim in pending and rng.random() < 0.2:
+            pending.pop(victim).cancel()
+            cancelled.add(victim)
+    loop.advance(float("inf"))
+    # Timers that never fired, or a count that drifted from the timers left
+    return errors + len(pending) + len(wheel)
+
+def main(count:int, seed:int) -> int:
+    rng = random.Random(seed)
+    failed = 0
+    for resolution, slots, levels in SETTINGS:
+        errors = check(resolution, slots, levels, count, rng)
+        failed += errors
+        print(f"resolution {resolution}, {slots} slots, {levels} levels: {errors} errors")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    sys.exit(main(count, seed))
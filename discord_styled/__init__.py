@@ -9,4 +9,7 @@ license: MIT
 
 from . import slash
 from . import permissions
-from . import buttons
\ No newline at end of file
+from . import buttons
+from . import timers
+from . import offload
+from . import dispatch
\ No newline at end of file
@@ -1,3 +1,6 @@
+import asyncio
+import weakref
+from collections import deque
 from typing import Any, Coroutine, Union
 import discord
 from discord.emoji import Emoji
@@ -5,7 +8,12 @@ from discord.message import Message
 from discord.partial_emoji import PartialEmoji
 from discord_slash.context import ComponentContext
 from discord_slash.model import ButtonStyle
-from discord_slash.utils.manage_components import create_actionrow, create_button, wait_for_component
+from discord_slash.error import IncorrectFormat
+from discord_slash.utils.manage_components import create_actionrow, create_button, get_components_ids, get_messages_ids
+from .timers import TimerWheel
+
+_timer_wheel = None
+_dispatcher = None
 
 def button(style:Union[int, str, ButtonStyle]="PRIMARY", label:Union[str, None]=None, emoji:Union[Emoji, PartialEmoji, str, None]=None, custom_id:Union[str, None]=None, url:Union[str, None]=None, disabled:bool=False) -> dict:
     """Creates a button for use within an action row
@@ -84,4 +92,234 @@ async def wait_button(client:discord.Client, buttons:Union[str, dict, list], mes
 
         button_ctx = await wait_for_component(bot, components=my_buttons)
     """
-    return await wait_for_component(client, messages, buttons, check, timeout)
+    if _dispatcher is None or not messages:
+        return await _wait_button(client, buttons, messages, check, timeout)
+    dispatcher = _dispatcher
+    message_ids = list(get_messages_ids(messages))
+    dispatcher.claim(message_ids)
+    try:
+        return await _wait_button(client, buttons, messages, check, timeout)
+    finally:
+        dispatcher.release(message_ids)
+
+async def _wait_button(client:discord.Client, buttons:Union[str, dict, list], messages:Union[Message, int, list, None], check, timeout):
+    future = _listen(client, "component", _ComponentFilter(buttons, messages, check))
+    return await _wait(future, timeout)
+
+class _ComponentFilter:
+    """Matches component interactions by custom id, message id and check, like `wait_for_component`"""
+
+    def __init__(self, buttons:Union[str, dict, list, None], messages:Union[Message, int, list, None], check=None) -> None:
+        if not (messages or buttons):
+            raise IncorrectFormat("You must specify messages or buttons (or both)")
+        self.message_ids = set(get_messages_ids(messages)) if messages else None
+        self.custom_ids = {str(id) for id in get_components_ids(buttons)} if buttons else None
+        self.check = check
+
+    def __call__(self, ctx:ComponentContext) -> bool:
+        if self.check and not self.check(ctx):
+            return False
+        wanted_message = not self.message_ids or ctx.origin_message_id in self.message_ids
+        wanted_button = not self.custom_ids or ctx.custom_id in self.custom_ids
+        return wanted_message and wanted_button
+
+def _listen(client:discord.Client, event:str, check) -> asyncio.Future:
+    """Register a listener like `client.wait_for` does. The future gets the event once `check`
+    returns True, a check that always returns False stays registered until the future is cancelled.
+    """
+    future = client.loop.create_future()
+    client._listeners.setdefault(event, []).append((future, check))
+    return future
+
+def use_timer_wheel(resolution:Union[float, None]=0.5, slots:int=64, levels:int=4) -> None:
+    """Share a `TimerWheel` between the timeouts of `wait_button` and `collect_buttons`
+    instead of creating one asyncio timer per waiter. Timeouts become up to `resolution` seconds late.
+
+    ### Args:
+        resolution (`Union[float, None], optional`): Seconds per tick, None to go back to asyncio timers. Defaults to 0.5.
+        slots (`int, optional`): Slots per level of the wheel. Defaults to 64.
+        levels (`int, optional`): Levels of the wheel. Defaults to 4.
+
+    ### Example: ::
+
+        use_timer_wheel(0.25)
+        button_ctx = await wait_button(bot, my_buttons, timeout=30)
+    """
+    global _timer_wheel
+    _timer_wheel = None if resolution is None else TimerWheel(resolution, slots, levels)
+
+def use_dispatcher(dispatcher:Union["ComponentDispatcher", None]) -> None:
+    """Route clicks between worker processes, `wait_button` and `collect_buttons` calls with
+    `messages` set receive clicks for those messages even if another process got them.
+
+    ### Args:
+        dispatcher (`Union[ComponentDispatcher, None]`): Started dispatcher, None to stop routing
+
+    ### Example: ::
+
+        dispatcher = ComponentDispatcher(slash, UnixSocketBackend("/tmp/discord-styled.sock"))
+        await dispatcher.start()
+        use_dispatcher(dispatcher)
+    """
+    global _dispatcher
+    _dispatcher = dispatcher
+
+async def _wait(future:asyncio.Future, timeout:Union[float, None]):
+    """Wait for a future, using the shared timer wheel for the timeout if enabled"""
+    if timeout is None or _timer_wheel is None:
+        return await asyncio.wait_for(future, timeout)
+    timer = _timer_wheel.schedule(timeout, future.cancel)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        if timer.expired:
+            raise asyncio.TimeoutError() from None
+        raise
+    finally:
+        timer.cancel()
+
+def _unregister(future:asyncio.Future, dispatcher, message_ids:Union[list, None]) -> None:
+    future.cancel()
+    if dispatcher is not None:
+        dispatcher.release(message_ids)
+
+class ButtonCollector:
+    """Async iterator over button interactions. Keeps a single listener registered from
+    creation until it's closed or dropped, so no click is missed between iterations.
+    Use `collect_buttons` to create it.
+
+    ### Args:
+        client (`discord.Client`): The client/bot object.
+        buttons (`Union[str, dict, list, None]`): Custom ID to check for, or button dict (buttons or button) or list of previous two.
+        messages (`Union[Message, int, list, None], optional`): The message object to check for, or the message ID or list of the previous two. Defaults to None.
+        check (`[type], optional`): Optional check function. Must take `ComponentContext` as the first parameter. Defaults to None.
+        max_count (`Union[int, None], optional`): Stop after this number of interactions. Defaults to None.
+        timeout (`Union[float, None], optional`): Stop if no interaction arrives for this number of seconds. Defaults to None.
+        deadline (`Union[float, None], optional`): Stop after this number of seconds in total. Defaults to None.
+        max_size (`int, optional`): Number of interactions buffered while the consumer is busy, extra ones are dropped and counted in `dropped`. Defaults to 100.
+    """
+
+    def __init__(self, client:discord.Client, buttons:Union[str, dict, list, None]=None, messages:Union[Message, int, list, None]=None, check=None, max_count:Union[int, None]=None, timeout:Union[float, None]=None, deadline:Union[float, None]=None, max_size:int=100) -> None:
+        self.client = client
+        self._filter = _ComponentFilter(buttons, messages, check)
+        self.max_count = max_count
+        self.timeout = timeout
+        self.max_size = max_size
+        self.count = 0
+        self.dropped = 0
+        self._buffer = deque()
+        self._waiter = None
+        self._error = None
+        self._closed = False
+        self._deadline = None if deadline is None else client.loop.time() + deadline
+        # The listener only keeps a weak reference, so a collector dropped without being
+        # closed (e.g. `break` out of `async for`) is garbage collected and unregistered
+        collector = weakref.ref(self)
+        def _collect(ctx:ComponentContext) -> bool:
+            instance = collector()
+            return instance._collect(ctx) if instance is not None else False
+        future = _listen(client, "component", _collect)
+        dispatcher = _dispatcher if self._filter.message_ids else None
+        message_ids = list(self._filter.message_ids) if dispatcher is not None else None
+        if dispatcher is not None:
+            dispatcher.claim(message_ids)
+        self._finalizer = weakref.finalize(self, _unregister, future, dispatcher, message_ids)
+
+    def _collect(self, ctx:ComponentContext) -> bool:
+        if self._closed:
+            return False
+        try:
+            if not self._filter(ctx):
+                return False
+        except Exception as exc:
+            self._error = exc
+            self.close()
+            return False
+        if self.max_count is not None and self.count + len(self._buffer) >= self.max_count:
+            return False
+        if len(self._buffer) >= self.max_size:
+            self.dropped += 1
+            return False
+        self._buffer.append(ctx)
+        self._wake()
+        return False
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def close(self) -> None:
+        """Stop collecting interactions. Already buffered ones are still returned."""
+        if not self._closed:
+            self._closed = True
+            self._finalizer()
+            self._wake()
+
+    def __aiter__(self) -> "ButtonCollector":
+        return self
+
+    async def __anext__(self) -> ComponentContext:
+        while not self._buffer:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            if self._closed:
+                raise StopAsyncIteration
+            timeout = self.timeout
+            if self._deadline is not None:
+                remaining = self._deadline - self.client.loop.time()
+                if remaining <= 0:
+                    self.close()
+                    continue
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            self._waiter = self.client.loop.create_future()
+            try:
+                await _wait(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                self.close()
+            finally:
+                self._waiter = None
+        self.count += 1
+        if self.max_count is not None and self.count >= self.max_count:
+            self.close()
+        return self._buffer.popleft()
+
+    async def __aenter__(self) -> "ButtonCollector":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+def collect_buttons(client:discord.Client, buttons:Union[str, dict, list, None]=None, messages:Union[Message, int, list, None]=None, check=None, max_count:Union[int, None]=None, timeout:Union[float, None]=None, deadline:Union[float, None]=None, max_size:int=100) -> ButtonCollector:
+    """Collects button interactions. Alternative to calling `wait_button` in a loop.
+    Unlike `wait_button`, timeouts end the iteration instead of raising `asyncio.TimeoutError`.
+
+    ### Args:
+        client (`discord.Client`): The client/bot object.
+        buttons (`Union[str, dict, list, None]`): Custom ID to check for, or button dict (buttons or button) or list of previous two.
+        messages (`Union[Message, int, list, None], optional`): The message object to check for, or the message ID or list of the previous two. Defaults to None.
+        check (`[type], optional`): Optional check function. Must take `ComponentContext` as the first parameter. Defaults to None.
+        max_count (`Union[int, None], optional`): Stop after this number of interactions. Defaults to None.
+        timeout (`Union[float, None], optional`): Stop if no interaction arrives for this number of seconds. Defaults to None.
+        deadline (`Union[float, None], optional`): Stop after this number of seconds in total. Defaults to None.
+        max_size (`int, optional`): Number of interactions buffered while the consumer is busy. Defaults to 100.
+
+    ### Returns:
+        `ButtonCollector`: Async iterator of `ComponentContext`
+
+    ### Example: ::
+
+        async with collect_buttons(bot, my_buttons, message, timeout=30, deadline=300) as clicks:
+            async for button_ctx in clicks:
+                await button_ctx.send("Voted!", hidden=True)
+    
+    ### Equivalent to: ::
+
+        while True:
+            try:
+                button_ctx = await wait_button(bot, my_buttons, message, timeout=30)
+            except asyncio.TimeoutError:
+                break
+            await button_ctx.send("Voted!", hidden=True)
+    """
+    return ButtonCollector(client, buttons, messages, check, max_count, timeout, deadline, max_size)
@@ -0,0 +1,381 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Callable, Union
+from discord_slash import SlashCommand
+from discord_slash.context import ComponentContext
+from .buttons import _listen
+from .utils.serialize import canonical
+
+# Max size of a batch frame on the Unix socket
+_LIMIT = 2 ** 24
+# Max clicks kept while the broker can't be reached
+_MAX_PENDING = 1000
+
+class Backend(ABC):
+    """Transport between worker processes and a broker that knows which process owns
+    each message. Subclass it to plug another broker (e.g. Redis pub/sub).
+    """
+
+    @abstractmethod
+    async def connect(self, receive:Callable[[list, list, list], None], disconnected:Callable[[Exception], None]) -> None:
+        """Connect to the broker, it may be called again after `close` to reconnect
+
+        ### Args:
+            receive (`Callable[[list, list, list], None]`): Called with the message ids claimed and released by other
+                processes and the interaction payloads forwarded to this process. Right after connecting it must get
+                every message id already claimed by other processes.
+            disconnected (`Callable[[Exception], None]`): Called when the connection is lost
+        """
+
+    @abstractmethod
+    async def send(self, claims:list, releases:list, payloads:list) -> None:
+        """Send one batch to the broker, raising if it couldn't be sent
+
+        ### Args:
+            claims (`list`): Message ids now waited on by this process
+            releases (`list`): Message ids no longer waited on by this process
+            payloads (`list`): Component interaction payloads to forward to their owner
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Disconnect from the broker, releasing every message id of this process"""
+
+def _owner(payload:dict) -> int:
+    return int(payload["message"]["id"])
+
+def _route(owners:dict, connections, sender, claims:list, releases:list, payloads:list) -> dict:
+    """Apply a batch from `sender` to the owners map and build the batch each other connection gets:
+    claims and releases are sent to everyone, payloads only to the owner of their message
+    """
+    claimed = []
+    for id in claims:
+        owners[id] = sender
+        claimed.append(id)
+    released = []
+    for id in releases:
+        if owners.get(id) is sender:
+            del owners[id]
+            released.append(id)
+    batches = {connection: ([], [], []) for connection in connections if connection is not sender}
+    for connection_claims, connection_releases, _ in batches.values():
+        connection_claims.extend(claimed)
+        connection_releases.extend(released)
+    for payload in payloads:
+        owner = owners.get(_owner(payload))
+        if owner in batches:
+            batches[owner][2].append(payload)
+    return {connection: batch for connection, batch in batches.items() if any(batch)}
+
+class MemoryBroker:
+    """In-process broker, useful to test several dispatchers in one process
+    and as a reference for other backends
+
+    ### Example: ::
+
+        broker = MemoryBroker()
+        dispatcher = ComponentDispatcher(slash, broker.backend())
+    """
+
+    def __init__(self) -> None:
+        self._owners = {}
+        self._backends = []
+
+    def backend(self) -> "MemoryBackend":
+        """Create a backend connected to this broker
+
+        ### Returns:
+            `MemoryBackend`: Backend for one dispatcher
+        """
+        return MemoryBackend(self)
+
+class MemoryBackend(Backend):
+    """Backend for a `MemoryBroker`, create it with `MemoryBroker.backend`"""
+
+    def __init__(self, broker:MemoryBroker) -> None:
+        self.broker = broker
+        self._receive = None
+
+    async def connect(self, receive:Callable[[list, list, list], None], disconnected:Callable[[Exception], None]) -> None:
+        self._receive = receive
+        self.broker._backends.append(self)
+        receive(list(self.broker._owners), [], [])
+
+    async def send(self, claims:list, releases:list, payloads:list) -> None:
+        batches = _route(self.broker._owners, self.broker._backends, self, claims, releases, payloads)
+        for backend, batch in batches.items():
+            asyncio.get_event_loop().call_soon(backend._receive, *batch)
+
+    async def close(self) -> None:
+        if self not in self.broker._backends:
+            return
+        owned = [id for id, owner in self.broker._owners.items() if owner is self]
+        await self.send([], owned, [])
+        self.broker._backends.remove(self)
+
+class UnixSocketBroker:
+    """Broker listening on a Unix socket. Run it in one of the workers or on its own with
+    `python -m discord_styled.dispatch <path>`.
+
+    ### Args:
+        path (`str`): Path of the socket
+    """
+
+    def __init__(self, path:str) -> None:
+        self.path = path
+        self._owners = {}
+        self._writers = set()
+        self._server = None
+
+    async def start(self) -> None:
+        """Start listening"""
+        self._server = await asyncio.start_unix_server(self._handle, self.path, limit=_LIMIT)
+
+    async def close(self) -> None:
+        """Stop listening and disconnect every process"""
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    def _send(self, batches:dict) -> None:
+        for writer, (claims, releases, payloads) in batches.items():
+            writer.write(canonical({"claim": claims, "release": releases, "forward": payloads}) + b"\n")
+
+    async def _handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        if self._owners:
+            self._send({writer: (list(self._owners), [], [])})
+        try:
+            async for line in reader:
+                frame = json.loads(line)
+                self._send(_route(self._owners, self._writers, writer, frame["claim"], frame["release"], frame["forward"]))
+        finally:
+            owned = [id for id, owner in self._owners.items() if owner is writer]
+            self._send(_route(self._owners, self._writers, writer, [], owned, []))
+            self._writers.discard(writer)
+            writer.close()
+
+class UnixSocketBackend(Backend):
+    """Backend for a `UnixSocketBroker`
+
+    ### Args:
+        path (`str`): Path of the broker socket
+    """
+
+    def __init__(self, path:str) -> None:
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._task = None
+
+    async def connect(self, receive:Callable[[list, list, list], None], disconnected:Callable[[Exception], None]) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=_LIMIT)
+        self._task = asyncio.ensure_future(self._read(receive, disconnected))
+
+    async def _read(self, receive:Callable[[list, list, list], None], disconnected:Callable[[Exception], None]) -> None:
+        try:
+            async for line in self._reader:
+                frame = json.loads(line)
+                receive(frame["claim"], frame["release"], frame["forward"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error = exc
+        else:
+            error = ConnectionResetError("The broker closed the connection")
+        self._writer.close()
+        disconnected(error)
+
+    async def send(self, claims:list, releases:list, payloads:list) -> None:
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionResetError("Not connected to the broker")
+        self._writer.write(canonical({"claim": claims, "release": releases, "forward": payloads}) + b"\n")
+        await self._writer.drain()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+class ComponentDispatcher:
+    """Forwards button clicks to the worker process where a `wait_button` or `collect_buttons`
+    is waiting for that message. The broker shares which messages each process waits on, so only
+    clicks for messages waited on in another process are sent to it. Only waiters with `messages`
+    set can be reached from other processes, and a click that arrives before the claim of its
+    message reached this process isn't forwarded. The process that received a forwarded click still
+    dispatches its own `component` event for it, so global `on_component` handlers run in both processes.
+    Needs the `socket_response` event of discord.py 1.x, like discord-py-slash-command.
+
+    ### Args:
+        slash (`SlashCommand`): SlashCommand object of this worker
+        backend (`Backend`): Connection to the broker
+        batch_delay (`float, optional`): Seconds to wait to group more messages in a batch, by default a batch holds everything queued in the same loop iteration. Defaults to 0.
+        retry_delay (`float, optional`): Seconds between attempts to reconnect to the broker. Defaults to 1.0.
+
+    ### Example: ::
+
+        dispatcher = ComponentDispatcher(slash, UnixSocketBackend("/tmp/discord-styled.sock"))
+        await dispatcher.start()
+        use_dispatcher(dispatcher)
+    """
+
+    def __init__(self, slash:SlashCommand, backend:Backend, batch_delay:float=0, retry_delay:float=1.0) -> None:
+        self.slash = slash
+        self.client = slash._discord
+        self.backend = backend
+        self.batch_delay = batch_delay
+        self.retry_delay = retry_delay
+        self._local = {}
+        self._remote = set()
+        self._claims = set()
+        self._releases = set()
+        self._payloads = []
+        self._flushing = False
+        self._connected = False
+        self._closed = False
+        self._reconnecting = None
+        self._future = None
+
+    async def start(self) -> None:
+        """Connect to the broker and start forwarding clicks"""
+        await self.backend.connect(self._receive, self._disconnected)
+        self._connected = True
+        self._future = _listen(self.client, "socket_response", self._forward)
+        self._schedule()
+
+    async def close(self) -> None:
+        """Stop forwarding clicks and disconnect from the broker"""
+        self._closed = True
+        self._connected = False
+        if self._future is not None:
+            self._future.cancel()
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+        await self.backend.close()
+
+    def _report(self, message:str, exc:Union[Exception, None]=None) -> None:
+        self.client.loop.call_exception_handler({"message": message, "exception": exc})
+
+    def _disconnected(self, exc:Exception) -> None:
+        if self._connected:
+            self._report("Lost connection to the component broker, reconnecting", exc)
+            self._lost()
+
+    def _lost(self) -> None:
+        self._connected = False
+        self._remote.clear()
+        # The broker drops the claims of a disconnected process, send them all again once reconnected
+        self._claims = set(self._local)
+        self._releases.clear()
+        if self._reconnecting is None and not self._closed:
+            self._reconnecting = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        try:
+            while not self._closed:
+                await asyncio.sleep(self.retry_delay)
+                try:
+                    await self.backend.close()
+                    await self.backend.connect(self._receive, self._disconnected)
+                except Exception as exc:
+                    self._report("Couldn't reconnect to the component broker", exc)
+                    continue
+                self._connected = True
+                self._schedule()
+                return
+        finally:
+            self._reconnecting = None
+
+    def claim(self, message_ids:list) -> None:
+        """Mark messages as waited on in this process
+
+        ### Args:
+            message_ids (`list`): Message ids
+        """
+        for id in message_ids:
+            count = self._local.get(id, 0)
+            self._local[id] = count + 1
+            if not count:
+                if id in self._releases:
+                    self._releases.discard(id)
+                else:
+                    self._claims.add(id)
+        self._schedule()
+
+    def release(self, message_ids:list) -> None:
+        """Mark messages as no longer waited on by one waiter of this process
+
+        ### Args:
+            message_ids (`list`): Message ids
+        """
+        for id in message_ids:
+            count = self._local.get(id, 0)
+            if count > 1:
+                self._local[id] = count - 1
+            elif count:
+                del self._local[id]
+                if id in self._claims:
+                    self._claims.discard(id)
+                else:
+                    self._releases.add(id)
+        self._schedule()
+
+    def _forward(self, msg:dict) -> bool:
+        if msg.get("t") != "INTERACTION_CREATE":
+            return False
+        payload = msg["d"]
+        if payload.get("type") != 3 or "message" not in payload:
+            return False
+        message_id = _owner(payload)
+        if message_id in self._local or message_id not in self._remote:
+            return False
+        self._payloads.append(payload)
+        self._schedule()
+        return False
+
+    def _receive(self, claims:list, releases:list, payloads:list) -> None:
+        self._remote.update(claims)
+        self._remote.difference_update(releases)
+        for payload in payloads:
+            ctx = ComponentContext(self.slash.req, payload, self.client, self.slash.logger)
+            self.client.dispatch("component", ctx)
+
+    def _schedule(self) -> None:
+        if self._connected and not self._flushing and (self._claims or self._releases or self._payloads):
+            self._flushing = True
+            asyncio.ensure_future(self._flush())
+
+    async def _flush(self) -> None:
+        try:
+            await asyncio.sleep(self.batch_delay)
+            while self._connected and (self._claims or self._releases or self._payloads):
+                claims, self._claims = list(self._claims), set()
+                releases, self._releases = list(self._releases), set()
+                payloads, self._payloads = self._payloads, []
+                try:
+                    await self.backend.send(claims, releases, payloads)
+                except Exception as exc:
+                    # Claims and releases are rebuilt from the local waiters by `_lost`, only clicks need to be kept
+                    self._payloads = payloads + self._payloads
+                    if len(self._payloads) > _MAX_PENDING:
+                        self._report(f"Dropped {len(self._payloads) - _MAX_PENDING} clicks waiting for the component broker")
+                        del self._payloads[:-_MAX_PENDING]
+                    if self._connected:
+                        self._report("Couldn't send a batch to the component broker, reconnecting", exc)
+                        self._lost()
+                    return
+        finally:
+            self._flushing = False
+
+if __name__ == "__main__":
+    import sys
+
+    async def main(path:str) -> None:
+        broker = UnixSocketBroker(path)
+        await broker.start()
+        await broker._server.serve_forever()
+
+    asyncio.get_event_loop().run_until_complete(main(sys.argv[1]))
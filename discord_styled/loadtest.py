@@ -0,0 +1,430 @@
+import asyncio
+import itertools
+from array import array
+import json
+import math
+import random
+import time
+import traceback
+import tracemalloc
+from collections import deque
+from typing import Union
+import discord
+from discord_slash.utils.manage_components import get_components_ids
+from .utils.serialize import canonical
+
+class FakeMessage(discord.Message):
+    """Message "sent" by a `FakeContext`, clicks can be generated on its buttons.
+    It's a `discord.Message` without state, so it can be passed to `wait_button` and `collect_buttons`,
+    only `id` and `components` are set.
+
+    ### Args:
+        id (`int`): Message id
+        components (`Union[list, None], optional`): Components sent with the message. Defaults to None.
+    """
+
+    def __init__(self, id:int, components:Union[list, None]=None) -> None:
+        self.id = id
+        self.components = components
+
+    def __repr__(self) -> str:
+        return f"<FakeMessage id={self.id}>"
+
+    async def edit(self, **kwargs) -> None:
+        if "components" in kwargs:
+            self.components = kwargs["components"]
+
+    async def delete(self, **kwargs) -> None:
+        pass
+
+class FakeContext:
+    """Stand-in for `SlashContext` and `ComponentContext` built from a generated event.
+    Responses are recorded instead of being sent to Discord.
+
+    ### Args:
+        harness (`Harness`): Harness that created the context
+        event (`dict`): Generated event
+    """
+
+    def __init__(self, harness:"Harness", event:dict) -> None:
+        self._harness = harness
+        self.bot = harness.client
+        self.created_at = time.perf_counter()
+        self.responded_at = None
+        # Latencies of the run this context belongs to, the harness doesn't keep contexts
+        self._latencies = harness._latencies
+        self.deferred = False
+        self.responded = False
+        self.interaction_id = event.get("id")
+        self.guild_id = event.get("guild_id")
+        self.channel_id = event.get("channel_id")
+        self.author_id = event.get("author_id")
+        self.name = self.command = event.get("name")
+        self.kwargs = event.get("options", {})
+        self.custom_id = self.component_id = event.get("custom_id")
+        self.component_type = 2 if self.custom_id is not None else None
+        self.origin_message_id = event.get("message_id")
+        self.origin_message = self._harness.messages.get(self.origin_message_id)
+        self.sent = []
+        self._recorded_sent = event.get("sent")
+
+    def _respond(self) -> None:
+        if self.responded_at is None:
+            self.responded_at = time.perf_counter()
+            self._latencies.append(self.responded_at - self.created_at)
+
+    async def defer(self, hidden:bool=False, edit_origin:bool=False, ignore:bool=False) -> None:
+        self._respond()
+        self.deferred = True
+
+    async def send(self, content:str="", **kwargs) -> FakeMessage:
+        self._respond()
+        self.responded = True
+        message = self._harness._message(kwargs.get("components"))
+        # When replaying, map the id this message had in the recorded run to the new one
+        if self._recorded_sent is not None and len(self.sent) < len(self._recorded_sent):
+            self._harness._replayed_ids[self._recorded_sent[len(self.sent)]] = message.id
+        self.sent.append(message.id)
+        return message
+
+    reply = send
+
+    async def edit_origin(self, **kwargs) -> None:
+        self._respond()
+        self.responded = True
+        if self.origin_message is not None:
+            await self.origin_message.edit(**kwargs)
+
+class Report:
+    """Results of a `Harness` run
+
+    ### Args:
+        latencies (`list[float]`): Seconds from dispatch to first response of each answered event
+        events (`int`): Number of events dispatched
+        duration (`float`): Seconds the run took
+        unanswered (`int`): Events nobody responded to
+        errors (`int`): Exceptions raised by commands
+        peak_memory (`Union[int, None]`): Peak traced memory in bytes, if it was traced
+        exceptions (`Union[list, None], optional`): First exceptions raised by commands. Defaults to None.
+    """
+
+    def __init__(self, latencies:list, events:int, duration:float, unanswered:int, errors:int, peak_memory:Union[int, None], exceptions:Union[list, None]=None) -> None:
+        self.latencies = sorted(latencies)
+        self.events = events
+        self.duration = duration
+        self.unanswered = unanswered
+        self.errors = errors
+        self.peak_memory = peak_memory
+        self.exceptions = exceptions or []
+
+    @property
+    def throughput(self) -> float:
+        """Events dispatched per second"""
+        return self.events / self.duration if self.duration else 0.0
+
+    def percentile(self, percent:float) -> Union[float, None]:
+        """Latency percentile in seconds, None if no event was answered
+
+        ### Args:
+            percent (`float`): Percentile between 0 and 100
+        """
+        if not self.latencies:
+            return None
+        # Nearest rank
+        index = min(len(self.latencies) - 1, max(0, math.ceil(percent / 100 * len(self.latencies)) - 1))
+        return self.latencies[index]
+
+    @property
+    def p50(self) -> Union[float, None]:
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> Union[float, None]:
+        return self.percentile(99)
+
+    def __str__(self) -> str:
+        lines = [
+            f"events: {self.events} in {self.duration:.2f}s ({self.throughput:.1f}/s)",
+            f"unanswered: {self.unanswered}, errors: {self.errors}",
+        ]
+        if self.latencies:
+            lines.append(f"latency p50: {self.p50 * 1000:.2f}ms, p99: {self.p99 * 1000:.2f}ms")
+        if self.peak_memory is not None:
+            lines.append(f"peak memory: {self.peak_memory / 1024 / 1024:.2f}MiB")
+        for exc in self.exceptions:
+            lines.append("error: " + "".join(traceback.format_exception_only(type(exc), exc)).strip())
+        return "\n".join(lines)
+
+def save_trace(events:list, path:str) -> None:
+    """Save recorded events as JSON lines
+
+    ### Args:
+        events (`list`): Events recorded by `Harness.run`
+        path (`str`): File to write
+    """
+    with open(path, "wb") as f:
+        for event in events:
+            f.write(canonical(event) + b"\n")
+
+def load_trace(path:str) -> list:
+    """Load events saved with `save_trace`
+
+    ### Args:
+        path (`str`): File to read
+
+    ### Returns:
+        `list`: Events, ready for `Harness.replay`
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class Harness:
+    """Load generator for code built on discord-interactions-styled, no connection to Discord needed.
+    Slash commands are invoked directly and button clicks are dispatched on the client,
+    so `wait_button` and `collect_buttons` receive them.
+
+    ### Args:
+        client (`Union[discord.Client, None], optional`): Client to dispatch on, it's never connected. Defaults to a new one.
+        users (`int, optional`): Number of different users generating events. Defaults to 1000.
+        seed (`Union[int, None], optional`): Seed for the random generator. Defaults to None.
+        max_targets (`int, optional`): Number of most recent buttons sent by commands clicks are generated for, older messages are forgotten. Defaults to 1000.
+        max_exceptions (`int, optional`): Number of exceptions raised by commands kept in the report, with their traceback. Defaults to 5.
+
+    ### Example: ::
+
+        harness = Harness(bot)
+        harness.add_command(my_command)
+        harness.add_buttons(my_buttons, message_id=123)
+        events = []
+        report = await harness.run(rate=500, duration=10, weights={"slash": 1, "component": 4}, record=events)
+        print(report)
+        save_trace(events, "trace.jsonl")
+    """
+
+    def __init__(self, client:Union[discord.Client, None]=None, users:int=1000, seed:Union[int, None]=None, max_targets:int=1000, max_exceptions:int=5) -> None:
+        self.client = client or discord.Client()
+        self.users = users
+        self.max_exceptions = max_exceptions
+        self.commands = {}
+        self.messages = {}
+        self.max_targets = max_targets
+        self._targets = deque()
+        self._target_counts = {}
+        self._static_targets = []
+        self._replayed_ids = {}
+        self.random = random.Random(seed)
+        self._message_ids = itertools.count(1)
+        self._interaction_ids = itertools.count(1)
+        self._latencies = array("d")
+        self._errors = 0
+        self._exceptions = []
+
+    def add_command(self, cmd, name:Union[str, None]=None) -> None:
+        """Register a slash command to generate events for. Arguments are generated from its options.
+
+        ### Args:
+            cmd: Command function (decorated with `option`/`options`) or `CommandObject`
+            name (`Union[str, None], optional`): Name of the command. Defaults to the name of the command or function.
+        """
+        name = name or getattr(cmd, "name", None) or cmd.__name__
+        self.commands[name] = cmd
+
+    def add_buttons(self, buttons:Union[dict, list], message_id:Union[int, None]=None) -> FakeMessage:
+        """Register buttons to generate clicks for, as if they were sent in a message. They're never forgotten.
+
+        ### Args:
+            buttons (`Union[dict, list]`): Button, action row or list of them
+            message_id (`Union[int, None], optional`): Id of the message. Defaults to a new id.
+
+        ### Raises:
+            `ValueError`: If a message with this id already has buttons
+
+        ### Returns:
+            `FakeMessage`: Message holding the buttons
+        """
+        if message_id in self.messages:
+            raise ValueError(f"Message {message_id} already exists")
+        message = self._message(buttons, message_id, False)
+        self._static_targets.extend((message.id, custom_id) for custom_id in get_components_ids(buttons))
+        return message
+
+    def _message(self, components:Union[dict, list, None], message_id:Union[int, None]=None, target:bool=True) -> FakeMessage:
+        if message_id is None:
+            # Skip the ids given to `add_buttons`
+            message_id = next(self._message_ids)
+            while message_id in self.messages:
+                message_id = next(self._message_ids)
+        message = FakeMessage(message_id, components)
+        # Only messages with buttons can be clicked, the others are never looked up
+        custom_ids = list(get_components_ids(components)) if components else []
+        if not custom_ids:
+            return message
+        self.messages[message.id] = message
+        if target:
+            self._target_counts[message.id] = len(custom_ids)
+            for custom_id in custom_ids:
+                if len(self._targets) >= self.max_targets:
+                    self._forget()
+                self._targets.append((message.id, custom_id))
+        return message
+
+    def _forget(self) -> None:
+        """Drop the oldest click target, and its message once none of its buttons are left"""
+        message_id, _ = self._targets.popleft()
+        self._target_counts[message_id] -= 1
+        if not self._target_counts[message_id]:
+            del self._target_counts[message_id]
+            del self.messages[message_id]
+
+    def _option_value(self, option:dict):
+        if option.get("choices"):
+            return self.random.choice(option["choices"])["value"]
+        option_type = option.get("type", 3)
+        if option_type == 4:
+            return self.random.randint(0, 100)
+        if option_type == 5:
+            return self.random.random() < 0.5
+        if option_type in (6, 7, 8, 9):
+            return self.random.randint(1, self.users)
+        if option_type == 10:
+            return self.random.random() * 100
+        return f"value{self.random.randint(0, 100)}"
+
+    def _generate(self, weights:dict) -> Union[dict, None]:
+        event = {
+            "guild_id": 1,
+            "channel_id": 1,
+            "author_id": self.random.randint(1, self.users),
+        }
+        targets = len(self._static_targets) + len(self._targets)
+        kinds = [kind for kind in ("slash", "component") if weights.get(kind) and (self.commands if kind == "slash" else targets)]
+        if not kinds:
+            return None
+        kind = self.random.choices(kinds, [weights[kind] for kind in kinds])[0]
+        if kind == "slash":
+            name = self.random.choice(list(self.commands))
+            options = getattr(self.commands[name], "options", None) or []
+            event.update(type="slash", name=name, options={
+                option["name"]: self._option_value(option)
+                for option in options if option.get("required") or self.random.random() < 0.5
+            })
+        else:
+            index = self.random.randrange(targets)
+            if index < len(self._static_targets):
+                message_id, custom_id = self._static_targets[index]
+            else:
+                message_id, custom_id = self._targets[index - len(self._static_targets)]
+            event.update(type="component", message_id=message_id, custom_id=custom_id)
+        return event
+
+    async def _invoke(self, cmd, ctx:FakeContext) -> None:
+        try:
+            if hasattr(cmd, "invoke"):
+                await cmd.invoke(ctx, **ctx.kwargs)
+            else:
+                await cmd(ctx, **ctx.kwargs)
+        except Exception as exc:
+            self._errors += 1
+            if len(self._exceptions) < self.max_exceptions:
+                self._exceptions.append(exc)
+
+    def dispatch(self, event:dict) -> FakeContext:
+        """Dispatch a single event, a slash command is invoked and a click is dispatched as `component`
+
+        ### Args:
+            event (`dict`): Generated or recorded event
+
+        ### Returns:
+            `FakeContext`: Context passed to the handlers
+        """
+        if "id" not in event:
+            event = dict(event, id=next(self._interaction_ids))
+        else:
+            event = dict(event)
+        if event["type"] == "component":
+            event["message_id"] = self._replayed_ids.get(event["message_id"], event["message_id"])
+        ctx = FakeContext(self, event)
+        if event["type"] == "slash":
+            asyncio.ensure_future(self._invoke(self.commands[event["name"]], ctx))
+        else:
+            self.client.dispatch("component", ctx)
+        return ctx
+
+    async def _run(self, events, grace:float, trace_memory:bool) -> Report:
+        self._latencies = latencies = array("d")
+        self._errors = 0
+        self._exceptions = []
+        self._replayed_ids = {}
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        count = 0
+        for event in events:
+            delay = start + event["at"] - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            ctx = self.dispatch(event)
+            # Recorded events keep their interaction id and the ids of the messages their handlers sent,
+            # so `replay` can reproduce them
+            event["id"] = ctx.interaction_id
+            event["sent"] = ctx.sent
+            count += 1
+            # Let handlers run even if the generator is behind schedule
+            if delay <= 0 and count % 100 == 0:
+                await asyncio.sleep(0)
+        duration = time.perf_counter() - start
+        await asyncio.sleep(grace)
+        peak_memory = None
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return Report(latencies, count, duration, count - len(latencies), self._errors, peak_memory, self._exceptions)
+
+    def _events(self, rate:float, duration:float, weights:dict, poisson:bool, record:Union[list, None]):
+        at = 0.0
+        while True:
+            at += self.random.expovariate(rate) if poisson else 1 / rate
+            if at >= duration:
+                return
+            event = self._generate(weights)
+            if event is None:
+                continue
+            event["at"] = at
+            if record is not None:
+                record.append(event)
+            yield event
+
+    async def run(self, rate:float, duration:float, weights:Union[dict, None]=None, poisson:bool=True, record:Union[list, None]=None, grace:float=1.0, trace_memory:bool=False) -> Report:
+        """Generate events at a given rate and measure how fast they're answered
+
+        ### Args:
+            rate (`float`): Events per second
+            duration (`float`): Seconds to generate events for
+            weights (`Union[dict, None], optional`): Relative weights of `"slash"` and `"component"` events. Defaults to equal weights.
+            poisson (`bool, optional`): Random arrivals instead of evenly spaced ones. Defaults to True.
+            record (`Union[list, None], optional`): List to append the generated events to, to replay them later. Defaults to None.
+            grace (`float, optional`): Seconds to wait for responses after the last event. Defaults to 1.0.
+            trace_memory (`bool, optional`): Trace peak memory with `tracemalloc`, it slows down the run. Defaults to False.
+
+        ### Returns:
+            `Report`: Throughput, latencies and memory
+        """
+        weights = weights or {"slash": 1, "component": 1}
+        return await self._run(self._events(rate, duration, weights, poisson, record), grace, trace_memory)
+
+    async def replay(self, events:list, speed:float=1.0, grace:float=1.0, trace_memory:bool=False) -> Report:
+        """Dispatch recorded events again with the same timing and interaction ids. Clicks on messages sent by handlers
+        go to the message sent by the same handler in this run, as long as it sends its messages
+        in the same order as in the recorded run.
+
+        ### Args:
+            events (`list`): Events recorded by `run` or loaded with `load_trace`
+            speed (`float, optional`): Replay speed multiplier. Defaults to 1.0.
+            grace (`float, optional`): Seconds to wait for responses after the last event. Defaults to 1.0.
+            trace_memory (`bool, optional`): Trace peak memory with `tracemalloc`. Defaults to False.
+
+        ### Returns:
+            `Report`: Throughput, latencies and memory
+        """
+        events = (dict(event, at=event["at"] / speed) for event in events)
+        return await self._run(events, grace, trace_memory)
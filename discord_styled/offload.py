@@ -0,0 +1,102 @@
+import asyncio
+import functools
+import importlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Union
+from discord_slash.context import InteractionContext
+
+_SNAPSHOT_ATTRS = (
+    "interaction_id", "guild_id", "channel_id", "author_id", "data", "values",
+    "name", "subcommand_name", "subcommand_group", "command_id", "target_id",
+    "custom_id", "component_type", "origin_message_id", "selected_options",
+)
+
+_executors = {False: None, True: None}
+
+class ContextSnapshot:
+    """Picklable copy of the plain data of a slash or component context, used in place
+    of the context when a handler runs in a process pool
+
+    ### Args:
+        ctx (`InteractionContext`): Context to copy
+    """
+
+    def __init__(self, ctx:InteractionContext) -> None:
+        for attr in _SNAPSHOT_ATTRS:
+            setattr(self, attr, getattr(ctx, attr, None))
+
+def set_executor(executor:Union[Executor, None], process:bool=False) -> None:
+    """Set the default pool used by `offload`
+
+    ### Args:
+        executor (`Union[Executor, None]`): Pool to use, None to go back to a default one created on first use
+        process (`bool, optional`): Whether it's the pool for `offload(process=True)`. Defaults to False.
+
+    ### Example: ::
+
+        set_executor(ThreadPoolExecutor(8))
+        set_executor(ProcessPoolExecutor(4), process=True)
+    """
+    _executors[process] = executor
+
+def _get_executor(process:bool) -> Executor:
+    if _executors[process] is None:
+        _executors[process] = ProcessPoolExecutor() if process else ThreadPoolExecutor()
+    return _executors[process]
+
+def _snapshot(value):
+    return ContextSnapshot(value) if isinstance(value, InteractionContext) else value
+
+def _call(module:str, qualname:str, args:tuple, kwargs:dict):
+    """Run an offloaded function inside a worker process, looking it up by name"""
+    func = importlib.import_module(module)
+    for name in qualname.split("."):
+        func = getattr(func, name)
+    return func.__offloaded__(*args, **kwargs)
+
+def offload(process:bool=False, executor:Union[Executor, None]=None):
+    """Decorator, run a synchronous function in a thread or process pool so it doesn't block
+    the event loop. The decorated function becomes a coroutine function returning the result.
+    In process mode contexts are replaced with a `ContextSnapshot`, the other arguments and the
+    result must be picklable and the function must be defined at module level.
+
+    ### Args:
+        process (`bool, optional`): Use a process pool instead of a thread pool. Defaults to False.
+        executor (`Union[Executor, None], optional`): Pool to use instead of the default one. Defaults to None.
+
+    ### Raises:
+        `TypeError`: If the decorated function is a coroutine function
+        `ValueError`: If the decorated function can't be run in a process pool
+
+    ### Example: ::
+
+        @offload(process=True)
+        def render_stats(ctx):
+            ...
+            return image
+
+        @slash.slash(...)
+        async def stats(ctx):
+            image = await render_stats(ctx)
+            await ctx.send(file=discord.File(image, "stats.png"))
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        process = True
+    def wrapper(func):
+        if asyncio.iscoroutinefunction(func):
+            raise TypeError(f"{func.__qualname__} is a coroutine function, only synchronous functions can be offloaded")
+        if process and "<locals>" in func.__qualname__:
+            raise ValueError(f"{func.__qualname__} must be defined at module level to run in a process pool")
+        @functools.wraps(func)
+        async def run(*args, **kwargs):
+            pool = executor or _get_executor(process)
+            if process:
+                args = tuple(_snapshot(value) for value in args)
+                kwargs = {key: _snapshot(value) for key, value in kwargs.items()}
+                call = functools.partial(_call, func.__module__, func.__qualname__, args, kwargs)
+            else:
+                call = functools.partial(func, *args, **kwargs)
+            return await asyncio.get_event_loop().run_in_executor(pool, call)
+        run.__offloaded__ = func
+        return run
+    return wrapper
@@ -0,0 +1,128 @@
+import asyncio
+import math
+from typing import Callable, Union
+
+class Timer:
+    """Handle of a callback scheduled in a `TimerWheel`"""
+
+    __slots__ = ("expires", "callback", "args", "expired", "_wheel", "_slot")
+
+    def __init__(self, wheel:"TimerWheel", expires:int, callback:Callable, args:tuple) -> None:
+        self._wheel = wheel
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.expired = False
+        self._slot = None
+
+    def cancel(self) -> None:
+        """Cancel the timer, does nothing if it already expired"""
+        if self._slot is not None:
+            self._slot.discard(self)
+            self._slot = None
+            self._wheel._count -= 1
+
+class TimerWheel:
+    """Hierarchical timer wheel. Timers are grouped in slots of `resolution` seconds and
+    expired in batches by a single loop callback, instead of one asyncio timer each.
+    Callbacks run between `delay` and `delay + resolution` seconds after being scheduled.
+
+    ### Args:
+        resolution (`float, optional`): Seconds per tick. Defaults to 0.5.
+        slots (`int, optional`): Slots per level. Defaults to 64.
+        levels (`int, optional`): Number of levels, delays over `resolution * slots ** levels` are checked again on every turn of the top level. Defaults to 4.
+        loop (`Union[asyncio.AbstractEventLoop, None], optional`): Event loop to use. Defaults to the current one.
+
+    ### Example: ::
+
+        wheel = TimerWheel(0.25)
+        timer = wheel.schedule(30, future.cancel)
+        timer.cancel()
+    """
+
+    def __init__(self, resolution:float=0.5, slots:int=64, levels:int=4, loop:Union[asyncio.AbstractEventLoop, None]=None) -> None:
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._loop = loop
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._tick = 0
+        self._start = 0.0
+        self._handle = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        return self._loop
+
+    def schedule(self, delay:float, callback:Callable, *args) -> Timer:
+        """Call `callback(*args)` after `delay` seconds, rounded up to the resolution
+
+        ### Args:
+            delay (`float`): Seconds to wait
+            callback (`Callable`): Function to call
+
+        ### Returns:
+            `Timer`: Handle to cancel the call
+        """
+        if self._handle is None:
+            self._start = self.loop.time()
+            self._tick = 0
+            self._handle = self.loop.call_at(self._start + self.resolution, self._advance)
+        ticks = max(1, math.ceil((self.loop.time() - self._start + delay) / self.resolution) - self._tick)
+        timer = Timer(self, self._tick + ticks, callback, args)
+        self._insert(timer)
+        self._count += 1
+        return timer
+
+    def _insert(self, timer:Timer) -> None:
+        remaining = timer.expires - self._tick
+        level = 0
+        while level < self.levels - 1 and remaining >= self._spans[level + 1]:
+            level += 1
+        # Timers further than the top level can hold stay in the slot of their expiry tick,
+        # they're checked again on every turn until they're due
+        slot = self._wheels[level][(timer.expires // self._spans[level]) % self.slots]
+        slot.add(timer)
+        timer._slot = slot
+
+    def _step(self) -> list:
+        self._tick += 1
+        for level in range(self.levels - 1, 0, -1):
+            if self._tick % self._spans[level] == 0:
+                slot = self._wheels[level][(self._tick // self._spans[level]) % self.slots]
+                timers = list(slot)
+                slot.clear()
+                for timer in timers:
+                    timer._slot = None
+                    self._insert(timer)
+        slot = self._wheels[0][self._tick % self.slots]
+        due = [timer for timer in slot if timer.expires <= self._tick]
+        for timer in due:
+            slot.discard(timer)
+            timer._slot = None
+        return due
+
+    def _advance(self) -> None:
+        # The loop may run the callback slightly early, always advance at least one tick
+        target = max(self._tick + 1, int((self.loop.time() - self._start) / self.resolution))
+        due = []
+        while self._tick < target:
+            due.extend(self._step())
+        self._count -= len(due)
+        for timer in due:
+            timer.expired = True
+            try:
+                timer.callback(*timer.args)
+            except Exception as exc:
+                self.loop.call_exception_handler({"message": "Exception in timer wheel callback", "exception": exc})
+        if self._count:
+            self._handle = self.loop.call_at(self._start + (self._tick + 1) * self.resolution, self._advance)
+        else:
+            self._handle = None
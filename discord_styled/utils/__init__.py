@@ -1 +1 @@
-from . import permissions, slash
\ No newline at end of file
+from . import buttons, permissions, serialize, slash
\ No newline at end of file
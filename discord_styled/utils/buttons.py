@@ -0,0 +1,73 @@
+from typing import Union
+from discord.emoji import Emoji
+from discord.partial_emoji import PartialEmoji
+from discord_slash.error import IncorrectFormat
+from discord_slash.model import ButtonStyle, ComponentType
+from ..buttons import button
+
+class Buttons:
+    """Creates a reusable action row template. Buttons without `custom_id` are slots
+    that get a new custom id every time the row is rendered.
+
+    ### Example: ::
+
+        confirm = Buttons()
+        confirm.add("success", "Yes")
+        confirm.add("danger", "No")
+        confirm.add(label="Help", url="https://example.com")
+    """
+
+    def __init__(self) -> None:
+        self.components = []
+        self._slots = []
+
+    def add(self, style:Union[int, str, ButtonStyle]="PRIMARY", label:Union[str, None]=None, emoji:Union[Emoji, PartialEmoji, str, None]=None, custom_id:Union[str, None]=None, url:Union[str, None]=None, disabled:bool=False) -> "Buttons":
+        """Add a button to the template, same arguments as `button`
+
+        ### Args:
+            style (`Union[int, str, ButtonStyle], optional`): The style of the button. Defaults to "PRIMARY".
+            label (`Union[str, None], optional`): The label of the button. Defaults to None.
+            emoji (`Union[Emoji, PartialEmoji, str, None], optional`): The emoji of the button. Defaults to None.
+            custom_id (`Union[str, None], optional`): Fixed id of the button, leave it empty to make the button a slot. Defaults to None.
+            url (`Union[str, None], optional`): The URL of the button. Needed for link buttons. Defaults to None.
+            disabled (`bool, optional`): Whether the button is disabled or not. Defaults to False.
+
+        ### Raises:
+            `IncorrectFormat`: If the row already has 5 buttons
+
+        ### Returns:
+            `Buttons`: The template
+        """
+        if len(self.components) == 5:
+            raise IncorrectFormat("Number of components in one row should be between 1 and 5.")
+        data = button(style, label, emoji, custom_id, url, disabled)
+        if custom_id is None and "custom_id" in data:
+            self._slots.append(len(self.components))
+        self.components.append(data)
+        return self
+
+    def render(self, *custom_ids:str) -> dict:
+        """Render an action row filling the slots in order. Fixed buttons are shared
+        between rendered rows, so don't modify them.
+
+        ### Args:
+            `custom_ids`: One custom id per slot
+
+        ### Raises:
+            `IncorrectFormat`: If the number of ids doesn't match the number of slots
+
+        ### Returns:
+            `dict`: Action row
+
+        ### Example: ::
+
+            await ctx.send("Are you sure?", components=[confirm.render(f"yes:{ctx.author_id}", f"no:{ctx.author_id}")])
+        """
+        if len(custom_ids) != len(self._slots):
+            raise IncorrectFormat(f"Expected {len(self._slots)} custom ids, got {len(custom_ids)}.")
+        if not self.components:
+            raise IncorrectFormat("Number of components in one row should be between 1 and 5.")
+        components = self.components.copy()
+        for index, custom_id in zip(self._slots, custom_ids):
+            components[index] = {**components[index], "custom_id": str(custom_id)}
+        return {"type": ComponentType.actionrow, "components": components}
@@ -1,6 +1,8 @@
+from copy import deepcopy
 from typing import Union
 from discord_slash.model import SlashCommandPermissionType
 from discord_slash.utils.manage_commands import create_permission
+from .serialize import canonical
 
 class Permissions:
     """Creates a slash command permissions template
@@ -18,7 +20,33 @@ class Permissions:
         self.permissions = {}
         for id in self.guild_ids:
             self.permissions[id] = []
+        self._serialized = None
     
+    def serialize(self) -> bytes:
+        """Get the canonical serialization of the template. It's cached until another permission is added,
+        every method returns a copy of the permissions so the cache can't go stale.
+
+        ### Returns:
+            `bytes`: Canonical JSON of the permissions
+        
+        ### Example: ::
+
+            permissions = Permissions(...)
+            permissions.allow_only_roles([123, 456, ...])
+            data = permissions.serialize()
+        """
+        if self._serialized is None:
+            self._serialized = canonical(self.permissions)
+        return self._serialized
+    
+    def _copy(self) -> dict:
+        """Copy the permissions, so changes to what's returned don't affect the template
+
+        ### Returns:
+            `dict`: Permissions
+        """
+        return deepcopy(self.permissions)
+
     def everyone_permission(self, allow:bool=False) -> dict:
         """Allow or deny permission to @everyone
 
@@ -37,7 +65,8 @@ class Permissions:
             permission = create_permission(id, SlashCommandPermissionType.ROLE, allow)
             if permission not in self.permissions[id]:
                 self.permissions[id].append(permission)
-        return self.permissions
+        self._serialized = None
+        return self._copy()
     
     def allow_users(self, users:list[int], allow:bool=True) -> dict:
         """Allow or deny permissions to a list of user ids
@@ -57,7 +86,8 @@ class Permissions:
         for id in self.guild_ids:
             for user in users:
                 self.permissions[id].append(create_permission(user, SlashCommandPermissionType.USER, allow))
-        return self.permissions
+        self._serialized = None
+        return self._copy()
     
     def allow_only_users(self, users:list[int]) -> dict:
         """Deny permissions for @everyone and allow them to a list of users ids
@@ -81,7 +111,7 @@ class Permissions:
         """
         self.everyone_permission(False)
         self.allow_users(users)
-        return self.permissions
+        return self._copy()
     
     def deny_users(self, users:list[int]) -> dict:
         """Deny permissions for a list of user ids, same as `allow_users(..., False)`
@@ -103,7 +133,7 @@ class Permissions:
             permissions.allow_users([123, 456, ...], False)
         """
         self.allow_users(users, False)
-        return self.permissions
+        return self._copy()
     
     def allow_roles(self, roles:list, allow:bool=True) -> dict:
         """Allow permissions for a list of role ids
@@ -123,7 +153,8 @@ class Permissions:
         for id in self.guild_ids:
             for role in roles:
                 self.permissions[id].append(create_permission(role, SlashCommandPermissionType.ROLE, allow))
-        return self.permissions
+        self._serialized = None
+        return self._copy()
     
     def allow_only_roles(self, roles:list) -> dict:
         """Deny permissions for @everyone and allow them to a list of role ids
@@ -146,8 +177,7 @@ class Permissions:
             permissions.allow_roles([123, 456, ...])
         """
         self.everyone_permission(False)
-        self.allow_roles(roles)
-        return self.permissions
+        return self.allow_roles(roles)
     
     def deny_roles(self, roles:list[int]) -> dict:
         """Deny permissions to a list of role ids, same as `allow_roles(..., False)`
@@ -168,5 +198,4 @@ class Permissions:
             permissions = Permissions(...)
             permissions.allow_roles([123, 456, ...], False)
         """
-        self.allow_roles(roles, False)
-        return self.permissions
\ No newline at end of file
+        return self.allow_roles(roles, False)
\ No newline at end of file
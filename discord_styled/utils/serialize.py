@@ -0,0 +1,138 @@
+import hashlib
+import json
+import math
+from enum import Enum
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_KEYS = {True: "true", False: "false", None: "null"}
+
+def _format_float(value:float) -> str:
+    """Format a float the way orjson does, shortest repr with a plain exponent
+    and no exponent for 1e-5 to 1e-4
+    """
+    text = repr(value)
+    if "e" not in text:
+        return text
+    mantissa, exponent = text.split("e")
+    if int(exponent) == -5:
+        sign = "-" if mantissa.startswith("-") else ""
+        return f"{sign}0.0000{mantissa.lstrip('-').replace('.', '')}"
+    return f"{mantissa}e{int(exponent)}"
+
+def _dumps(obj:Any) -> str:
+    """Encode a normalized payload that contains floats"""
+    if isinstance(obj, float):
+        return _format_float(obj)
+    if isinstance(obj, dict):
+        return "{" + ",".join(f"{_dumps(key)}:{_dumps(obj[key])}" for key in sorted(obj)) + "}"
+    if isinstance(obj, list):
+        return "[" + ",".join(_dumps(value) for value in obj) + "]"
+    return json.dumps(obj, ensure_ascii=False)
+
+def _normalize(obj:Any, floats:list) -> Any:
+    if obj is None or isinstance(obj, (str, bool)):
+        return obj
+    if isinstance(obj, Enum):
+        return _normalize(obj.value, floats)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise ValueError(f"Out of range float value {obj!r} can't be serialized")
+        floats.append(obj)
+        return float(obj)
+    if isinstance(obj, dict):
+        data = {}
+        for key, value in obj.items():
+            key = key.value if isinstance(key, Enum) else key
+            if key is None or isinstance(key, bool):
+                name = _KEYS[key]
+            elif isinstance(key, float):
+                name = _format_float(key)
+            else:
+                name = str(key)
+            if name in data:
+                raise ValueError(f"Key {key!r} collides with another key once converted to string {name!r}")
+            data[name] = _normalize(value, floats)
+        return data
+    if isinstance(obj, (list, tuple)):
+        return [_normalize(value, floats) for value in obj]
+    raise TypeError(f"Object of type {type(obj).__name__} can't be serialized")
+
+def normalize(obj:Any) -> Any:
+    """Convert a payload into plain JSON types so it always serializes the same way
+
+    ### Args:
+        obj (`Any`): Payload made of dicts, lists, tuples, enums and scalars
+
+    ### Raises:
+        `TypeError`: If the payload contains a value that can't be sent to Discord
+        `ValueError`: If the payload contains NaN or infinity, or two keys that are equal as strings
+
+    ### Returns:
+        `Any`: Payload with string keys, lists instead of tuples and enums replaced by their values
+    """
+    return _normalize(obj, [])
+
+def canonical(obj:Any) -> bytes:
+    """Serialize a payload into canonical bytes, sorted keys and no whitespace.
+    Uses `orjson` when it's installed. Payloads it can't encode (keys that aren't strings,
+    integers beyond 64 bits) go through `normalize` first, and floats are always written the
+    way orjson writes them, so the output doesn't depend on which backend is used.
+
+    ### Args:
+        obj (`Any`): Payload to serialize, e.g. a button, an action row or an options template
+
+    ### Raises:
+        `TypeError`: If the payload contains a value that can't be sent to Discord
+        `ValueError`: If the payload contains NaN or infinity, or two keys that are equal as strings
+
+    ### Returns:
+        `bytes`: UTF-8 encoded JSON
+
+    ### Example: ::
+
+        data = canonical(button(label="Hi!", custom_id="hi"))
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        except TypeError:
+            pass
+        else:
+            # orjson writes NaN and infinity as null, they don't survive the round trip
+            if b"null" not in data or orjson.loads(data) == obj:
+                return data
+    floats = []
+    obj = _normalize(obj, floats)
+    if floats:
+        return _dumps(obj).encode("utf-8")
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def fingerprint(obj:Any) -> str:
+    """Hash a payload from its canonical serialization, useful to diff commands or components
+
+    ### Args:
+        obj (`Any`): Payload to hash, or bytes already returned by `canonical`
+
+    ### Returns:
+        `str`: SHA-256 hex digest
+
+    ### Example: ::
+
+        if fingerprint(my_options.serialize()) != stored_hash:
+            ...
+    """
+    if not isinstance(obj, bytes):
+        obj = canonical(obj)
+    return hashlib.sha256(obj).hexdigest()
@@ -1,5 +1,7 @@
+from copy import deepcopy
 from typing import Union
 from discord_slash.utils.manage_commands import create_choice, create_option
+from .serialize import canonical
 
 
 class Options:
@@ -12,6 +14,7 @@ class Options:
     
     def __init__(self) -> None:
         self.options = []
+        self._serialized = None
     
     def _prepare_choices(self, choices:list) -> list:
         """Convert list of choices to dictionaries
@@ -35,7 +38,7 @@ class Options:
         return choices
     
     def template(self) -> list:
-        """Get the options template. Note: Don't do this until you've defined all your options.
+        """Get a copy of the options template. Note: Don't do this until you've defined all your options.
 
         ### Returns:
             `list`: Template of options
@@ -50,7 +53,24 @@ class Options:
 
             my_options = Options().add("option1", "etc...")
         """
-        return self.options
+        return deepcopy(self.options)
+
+    def serialize(self) -> bytes:
+        """Get the canonical serialization of the template. It's cached until another option is added,
+        every method returns a copy of the options so the cache can't go stale.
+
+        ### Returns:
+            `bytes`: Canonical JSON of the options
+        
+        ### Example: ::
+
+            my_options = Options()
+            my_options.add("option1", "etc..")
+            data = my_options.serialize()
+        """
+        if self._serialized is None:
+            self._serialized = canonical(self.options)
+        return self._serialized
 
     def add(self, name:str, description:str, type:Union[type, int]=3, required:bool=True, choices:list=[]) -> list:
         """Add option to template
@@ -67,7 +87,8 @@ class Options:
         """
         choices = self._prepare_choices(choices)
         self.options.append(create_option(name, description, type, required, choices))
-        return self.options
+        self._serialized = None
+        return self.template()
     
     def add_from_dict(self, option:dict) -> list:
         """Generate option from dictionary and add it to template
@@ -89,12 +110,16 @@ class Options:
             my_options = Options()
             my_options.add("my_option", "My description")
         """
+        self._append_dict(option)
+        return self.template()
+
+    def _append_dict(self, option:dict) -> None:
         option_type = 3 if "type" not in option else option["type"]
         required = True if "required" not in option else option["required"]
         choices = [] if "choices" not in option else self._prepare_choices(option["choices"])
         self.options.append(create_option(option["name"], option["description"], option_type, required, choices))
-        return self.options
-    
+        self._serialized = None
+
     def add_from_dicts(self, options:list[dict]) -> list:
         """Generate options from a list of dicts and add them to template
 
@@ -122,5 +147,5 @@ class Options:
             my_options.add("option3", "Three options", choices=["choice1"])
         """
         for option in options:
-            self.add_from_dict(option)
-        return self.options
\ No newline at end of file
+            self._append_dict(option)
+        return self.template()
\ No newline at end of file
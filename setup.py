@@ -11,6 +11,7 @@ setup(
     author_email="gammxplus@gmail.com",
     description="A simple set of tools to write easier code using discord-py-interactions",
     install_requires=["discord.py", "discord-py-slash-command"],
+    extras_require={"speed": ["orjson"]},
     license="MIT License",
     long_description=README,
     long_description_content_type="text/markdown",